@@ -23,6 +23,7 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 import logging
 import random
+from functools import lru_cache
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
@@ -181,7 +182,83 @@ def human_delay(min_sec=1, max_sec=3):
     time.sleep(delay)
     return delay
 
-def extract_concerts_simple(driver, artist_name, debug_info):
+# Precompiled patterns for normalizing extracted dates and locations
+MONTH_ABBRS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+DATE_PATTERN = re.compile(
+    r'\b(JAN(?:UARY)?|FEB(?:RUARY)?|MAR(?:CH)?|APR(?:IL)?|MAY|JUNE?|JULY?|AUG(?:UST)?|'
+    r'SEP(?:T(?:EMBER)?)?|OCT(?:OBER)?|NOV(?:EMBER)?|DEC(?:EMBER)?)\b\.?'
+    r'\s+(\d{1,2})(?:ST|ND|RD|TH)?\b(?:,?\s+(\d{4})\b)?',
+    re.IGNORECASE
+)
+LOCATION_PATTERN = re.compile(r'([A-Za-z\s]+,\s*[A-Z]{2})\b')
+CITY_STATE_PATTERN = re.compile(r'^\s*(.+?)\s*,\s*([A-Z]{2})\s*$')
+DATE_GRACE_DAYS = 1
+
+@lru_cache(maxsize=65536)
+def normalize_concert_date(date_str, is_past, reference_date):
+    """Parse a raw date line to ISO format, inferring the year from Past/Upcoming context"""
+    match = DATE_PATTERN.search(date_str or '')
+    if not match:
+        return ''
+    
+    month = MONTH_ABBRS.index(match.group(1).upper()[:3]) + 1
+    day = int(match.group(2))
+    
+    if match.group(3):
+        years = [int(match.group(3))]
+    else:
+        # Span a full leap cycle either side so FEB 29 still resolves
+        years = range(reference_date.year - 4, reference_date.year + 5)
+    
+    candidates = []
+    for year in years:
+        try:
+            candidates.append(datetime(year, month, day).date())
+        except ValueError:
+            continue
+    
+    if not candidates:
+        return ''
+    if match.group(3):
+        return candidates[0].isoformat()
+    
+    # Past events cannot be in the future, upcoming events cannot be in the past,
+    # measured in the venue's local date. The reference date is the server's
+    # (UTC on Railway), and UTC offsets run from -12h to +14h, so the venue can be
+    # up to one day behind (tonight's US show while UTC is already tomorrow) or
+    # ahead (a show in Asia/Oceania that has finished before UTC reaches that day).
+    # DATE_GRACE_DAYS covers that offset in each direction.
+    grace = timedelta(days=DATE_GRACE_DAYS)
+    if is_past:
+        valid = [d for d in candidates if d <= reference_date + grace]
+        return max(valid).isoformat() if valid else ''
+    valid = [d for d in candidates if d >= reference_date - grace]
+    return min(valid).isoformat() if valid else ''
+
+@lru_cache(maxsize=65536)
+def normalize_location(location_str):
+    """Split a "City, ST" fragment into (city, state)"""
+    match = CITY_STATE_PATTERN.match(location_str or '')
+    if not match:
+        return '', ''
+    return match.group(1), match.group(2)
+
+def normalize_concert(concert, is_past, reference_date=None):
+    """Add normalized date and location fields alongside the raw ones"""
+    if reference_date is None:
+        reference_date = datetime.now().date()
+    
+    concert['concert_date_iso'] = normalize_concert_date(concert.get('concert_date', ''), is_past, reference_date)
+    concert['venue_city'], concert['venue_state'] = normalize_location(concert.get('venue_address', ''))
+    return concert
+
+# CSV export columns: raw extracted fields followed by their normalized forms
+CSV_FIELDNAMES = [
+    'artist_name', 'venue_name', 'venue_address', 'concert_date',
+    'concert_date_iso', 'venue_city', 'venue_state'
+]
+
+def extract_concerts_simple(driver, artist_name, debug_info, is_past=False):
     """Simple but effective concert extraction"""
     concerts = []
     
@@ -209,9 +286,6 @@ def extract_concerts_simple(driver, artist_name, debug_info):
             'Academy', 'School', 'College', 'University', 'Fairgrounds'
         ]
         
-        # Month abbreviations for dates
-        months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-        
         # Find lines with venue keywords
         venue_lines = []
         for i, line in enumerate(lines):
@@ -222,6 +296,7 @@ def extract_concerts_simple(driver, artist_name, debug_info):
         
         # Process each venue line
         processed_venues = set()
+        reference_date = datetime.now().date()
         
         for venue_data in venue_lines[:30]:  # Process up to 30 potential venues
             try:
@@ -242,15 +317,23 @@ def extract_concerts_simple(driver, artist_name, debug_info):
                 start_idx = max(0, line_index - search_range)
                 end_idx = min(len(lines), line_index + search_range + 1)
                 
+                # Prefer a real "MON DD" line so venue/city names like
+                # "Augusta" or "Decatur" aren't mistaken for dates
                 for nearby_line in lines[start_idx:end_idx]:
-                    if any(month in nearby_line.upper() for month in months):
+                    if DATE_PATTERN.search(nearby_line):
                         date_str = nearby_line.strip()
                         break
-                
+
+                if not date_str:
+                    for nearby_line in lines[start_idx:end_idx]:
+                        if any(month in nearby_line.upper() for month in MONTH_ABBRS):
+                            date_str = nearby_line.strip()
+                            break
+
                 # Look for location (City, ST format)
                 location_str = ""
                 for nearby_line in lines[start_idx:end_idx]:
-                    location_match = re.search(r'([A-Za-z\s]+,\s*[A-Z]{2})\b', nearby_line)
+                    location_match = LOCATION_PATTERN.search(nearby_line)
                     if location_match:
                         location_str = location_match.group(1).strip()
                         break
@@ -267,12 +350,13 @@ def extract_concerts_simple(driver, artist_name, debug_info):
                         'venue_address': location_str or 'Not specified',
                         'concert_date': date_str or 'Date not found'
                     }
+                    normalize_concert(concert, is_past, reference_date)
                     
                     concerts.append(concert)
                     processed_venues.add(venue_name)
                     debug_info.append(f"   ✅ Added: {venue_name}")
                     if date_str:
-                        debug_info.append(f"      📅 Date: {date_str}")
+                        debug_info.append(f"      📅 Date: {date_str} -> {concert['concert_date_iso'] or 'unparsed'}")
                     if location_str:
                         debug_info.append(f"      📍 Location: {location_str}")
                 
@@ -393,6 +477,8 @@ def scrape_artist_concerts(artist_url, max_retries=2):
             
             # Try to click Past tab
             debug_info.append("🔍 Looking for Past tab in Concerts section...")
+            clicked_past = False
+            is_past = False
             try:
                 # Look for the Concerts and tour dates section first
                 concert_section_found = False
@@ -417,7 +503,6 @@ def scrape_artist_concerts(artist_url, max_retries=2):
                     "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'past')]"
                 ]
                 
-                clicked_past = False
                 for i, selector in enumerate(past_selectors):
                     try:
                         elements = driver.find_elements(By.XPATH, selector)
@@ -456,6 +541,15 @@ def scrape_artist_concerts(artist_url, max_retries=2):
                 if clicked_past:
                     debug_info.append("✅ Successfully clicked Past tab, waiting for content...")
                     human_delay(4, 7)  # Wait for Past concerts to load
+                    
+                    # Only the exact 'Past' selectors are trusted for year inference;
+                    # the catch-all also matches text like "Pastor ..."
+                    if i < len(past_selectors) - 1:
+                        is_past = True
+                    else:
+                        warning = f"⚠️ Past tab matched only by catch-all selector for {artist_name}, treating dates as Upcoming"
+                        debug_info.append(warning)
+                        logger.warning(warning)
                 else:
                     debug_info.append("⚠️ Could not click Past tab, using current page (Upcoming)")
             
@@ -464,7 +558,7 @@ def scrape_artist_concerts(artist_url, max_retries=2):
             
             # Extract concerts
             debug_info.append("🎵 Extracting concerts...")
-            concerts = extract_concerts_simple(driver, artist_name, debug_info)
+            concerts = extract_concerts_simple(driver, artist_name, debug_info, is_past=is_past)
             
             # Success - break retry loop
             break
@@ -624,7 +718,7 @@ def download_csv():
     temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='')
     
     try:
-        writer = csv.DictWriter(temp_file, fieldnames=['artist_name', 'venue_name', 'venue_address', 'concert_date'])
+        writer = csv.DictWriter(temp_file, fieldnames=CSV_FIELDNAMES)
         writer.writeheader()
         writer.writerows(concert_data)
         temp_file.close()
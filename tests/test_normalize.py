@@ -0,0 +1,122 @@
+from datetime import date
+
+import pytest
+
+from app import extract_concerts_simple, normalize_concert, normalize_concert_date, normalize_location
+
+TODAY = date(2026, 10, 19)
+
+
+@pytest.mark.parametrize('date_str, is_past, expected', [
+    # Past: most recent matching date not after today
+    ('SAT, MAR 15', True, '2026-03-15'),
+    ('DEC 31', True, '2025-12-31'),
+    ('NOV 2', True, '2025-11-02'),
+    # Upcoming: next matching date not before today
+    ('JAN 5', False, '2027-01-05'),
+    ('OCT 25 - 7:00 PM', False, '2026-10-25'),
+    ('MAR 15', False, '2027-03-15'),
+    # Explicit year overrides inference either way
+    ('Mar 15, 2024', True, '2024-03-15'),
+    ('Mar 15, 2024', False, '2024-03-15'),
+    ('DEC 31 2030', True, '2030-12-31'),
+    # FEB 29 resolves to the nearest leap year
+    ('FEB 29', True, '2024-02-29'),
+    ('FEB 29', False, '2028-02-29'),
+    ('Feb 29, 2025', True, ''),
+    # Full month names and ordinals
+    ('Sept. 3rd', True, '2026-09-03'),
+    ('September 3', False, '2027-09-03'),
+    ('Sat, Oct 12th', True, '2026-10-12'),
+])
+def test_normalize_concert_date(date_str, is_past, expected):
+    assert normalize_concert_date(date_str, is_past, TODAY) == expected
+
+
+@pytest.mark.parametrize('date_str, is_past, expected', [
+    # Server clock (UTC) can run a day ahead of or behind the venue
+    ('OCT 19', False, '2026-10-19'),
+    ('OCT 18', False, '2026-10-18'),
+    ('OCT 17', False, '2027-10-17'),
+    ('OCT 19', True, '2026-10-19'),
+    ('OCT 20', True, '2026-10-20'),
+    ('OCT 21', True, '2025-10-21'),
+])
+def test_normalize_concert_date_grace_window(date_str, is_past, expected):
+    assert normalize_concert_date(date_str, is_past, TODAY) == expected
+
+
+@pytest.mark.parametrize('date_str', [
+    'Date not found', '', None, 'Augusta Civic Center', 'MAR 32',
+    # Words that merely start with a month abbreviation
+    'Decatur 5th Street', 'Augusta 2', 'Marion 3 Shows', 'Junction 12', 'Mayfield 1',
+])
+def test_normalize_concert_date_unparseable(date_str):
+    assert normalize_concert_date(date_str, True, TODAY) == ''
+
+
+@pytest.mark.parametrize('location_str, expected', [
+    ('Nashville, TN', ('Nashville', 'TN')),
+    ('  North Little Rock ,AR ', ('North Little Rock', 'AR')),
+    ('Not specified', ('', '')),
+    ('', ('', '')),
+    (None, ('', '')),
+    ('Nashville, Tennessee', ('', '')),
+])
+def test_normalize_location(location_str, expected):
+    assert normalize_location(location_str) == expected
+
+
+def test_normalize_concert_keeps_raw_fields():
+    concert = {
+        'artist_name': 'Test Artist',
+        'venue_name': 'First Baptist Church',
+        'venue_address': 'Decatur, AL',
+        'concert_date': 'SAT, OCT 12'
+    }
+    normalize_concert(concert, True, TODAY)
+    assert concert['concert_date'] == 'SAT, OCT 12'
+    assert concert['venue_address'] == 'Decatur, AL'
+    assert concert['concert_date_iso'] == '2026-10-12'
+    assert concert['venue_city'] == 'Decatur'
+    assert concert['venue_state'] == 'AL'
+
+
+class FakeElement:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeDriver:
+    def __init__(self, text):
+        self.text = text
+
+    def find_element(self, by, value):
+        return FakeElement(self.text)
+
+
+def test_extract_prefers_real_date_line_over_month_lookalikes():
+    text = '\n'.join([
+        'Concerts and tour dates ' + 'x' * 100,
+        'Augusta Civic Center',
+        'Decatur, AL',
+        'SAT, OCT 12',
+    ])
+    concerts = extract_concerts_simple(FakeDriver(text), 'Test Artist', [], is_past=True)
+    venue = next(c for c in concerts if c['venue_name'] == 'Augusta Civic Center')
+    assert venue['concert_date'] == 'SAT, OCT 12'
+    assert venue['concert_date_iso'].endswith('-10-12')
+    assert venue['venue_city'] == 'Decatur'
+
+
+def test_extract_skips_address_line_above_date_line():
+    text = '\n'.join([
+        'Concerts and tour dates ' + 'x' * 100,
+        'Decatur 5th Street',
+        'First Baptist Church',
+        'SAT, OCT 12',
+    ])
+    concerts = extract_concerts_simple(FakeDriver(text), 'Test Artist', [], is_past=True)
+    venue = next(c for c in concerts if c['venue_name'] == 'First Baptist Church')
+    assert venue['concert_date'] == 'SAT, OCT 12'
+    assert venue['concert_date_iso'] == '2026-10-12'